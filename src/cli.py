@@ -207,6 +207,8 @@ def main():
                              help='Export single event to iCal (specify event ID)')
     export_group.add_argument('--include-enhanced', action='store_true',
                              help='Include enhanced content in CSV export')
+    export_group.add_argument('--workers', type=int, default=1,
+                             help='Split large CSV/iCal exports by date across this many processes')
     
     # Data management
     data_group = parser.add_argument_group('Data Management')
@@ -302,7 +304,8 @@ def main():
             location=args.location,
             date_from=args.date_from,
             date_to=args.date_to,
-            include_enhanced=args.include_enhanced
+            include_enhanced=args.include_enhanced,
+            num_workers=args.workers
         )
         return
     
@@ -313,7 +316,8 @@ def main():
             event_type=args.type,
             location=args.location,
             date_from=args.date_from,
-            date_to=args.date_to
+            date_to=args.date_to,
+            num_workers=args.workers
         )
         return
     
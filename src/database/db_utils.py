@@ -8,7 +8,29 @@ def get_db_path():
 
 def get_db_connection():
     """Create and return a database connection."""
-    return sqlite3.connect(get_db_path())
+    conn = sqlite3.connect(get_db_path())
+    # WAL lets readers run alongside the writer and needs fewer fsyncs per
+    # commit. With synchronous=NORMAL a power loss can roll back the last
+    # few commits, but cannot corrupt the database.
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA temp_store=MEMORY')
+    # Read pages through mmap and keep a larger page cache per connection
+    conn.execute('PRAGMA mmap_size=268435456')
+    conn.execute('PRAGMA cache_size=-65536')
+    return conn
+
+def get_readonly_connection():
+    """Create and return a read-only database connection for queries."""
+    # mode=ro never takes write locks or creates a journal; immutable=1 is
+    # not used since the scraper may be writing to the WAL at the same time
+    uri = Path(get_db_path()).resolve().as_uri() + '?mode=ro'
+    conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+    conn.execute('PRAGMA query_only=ON')
+    conn.execute('PRAGMA temp_store=MEMORY')
+    conn.execute('PRAGMA mmap_size=268435456')
+    conn.execute('PRAGMA cache_size=-65536')
+    return conn
 
 def execute_query(query, params=None, fetch=True):
     """Execute a query and optionally fetch results."""
@@ -244,22 +244,26 @@ class RecoveryManager:
         """
         Create a backup of the database
         
+        Uses SQLite's online backup API, which copies a consistent snapshot
+        through the open connection (including pages still in the WAL).
+        
         Returns:
             Path to backup file
         """
-        import shutil
-        
         if backup_name is None:
             backup_name = f'backup_{datetime.now().strftime("%Y%m%d_%H%M%S")}.db'
         
         backup_dir = Path(__file__).parent.parent.parent / 'data' / 'backups'
         backup_dir.mkdir(exist_ok=True)
         
-        db_path = Path(__file__).parent.parent.parent / 'data' / 'olympic_college.db'
         backup_path = backup_dir / backup_name
         
         try:
-            shutil.copy2(db_path, backup_path)
+            backup_conn = sqlite3.connect(backup_path)
+            try:
+                self.conn.backup(backup_conn)
+            finally:
+                backup_conn.close()
             logger.info(f"Database backup created: {backup_path}")
             return backup_path
         
@@ -271,22 +275,22 @@ class RecoveryManager:
         """
         Restore database from backup
         
+        Copies the backup into the open connection with SQLite's online
+        backup API, so the restore goes through the database's locks and
+        WAL instead of overwriting the file under other connections.
+        
         Args:
             backup_path: Path to backup file
         
         Returns:
             True if successful
         """
-        import shutil
-        
-        db_path = Path(__file__).parent.parent.parent / 'data' / 'olympic_college.db'
-        
         try:
-            # Close current connection
-            self.conn.close()
-            
-            # Restore backup
-            shutil.copy2(backup_path, db_path)
+            backup_conn = sqlite3.connect(backup_path)
+            try:
+                backup_conn.backup(self.conn)
+            finally:
+                backup_conn.close()
             logger.info(f"Database restored from backup: {backup_path}")
             
             return True
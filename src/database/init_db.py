@@ -4,6 +4,7 @@ import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 from database.db_utils import get_db_connection, get_db_path
+from database.schema import ensure_event_indexes, ensure_page_cache_table
 
 def init_database():
     # Create database directory if it doesn't exist
@@ -30,6 +31,10 @@ def init_database():
     )
     ''')
 
+    # Unique (title, date, time) key and (date, time) index; databases
+    # from before the key existed may hold duplicates, which are removed
+    ensure_event_indexes(cursor)
+
     # Create categories table for event categorization
     cursor.execute('''
     CREATE TABLE IF NOT EXISTS categories (
@@ -62,6 +67,9 @@ def init_database():
     )
     ''')
 
+    # Create page cache table for conditional requests when scraping
+    ensure_page_cache_table(cursor)
+
     # Create event recommendations table
     cursor.execute('''
     CREATE TABLE IF NOT EXISTS event_recommendations (
@@ -0,0 +1,81 @@
+"""
+Shared Schema Definitions
+
+Tables and indexes that both database setup and the scraper create, kept
+in one place so every caller builds them the same way.
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+from database.error_handling import logger
+
+# Events are unique on (title, date, time); the scraper upserts on this key
+EVENT_KEY_INDEX_SQL = '''
+    CREATE UNIQUE INDEX IF NOT EXISTS ux_events_key
+    ON events(title, date, IFNULL(time, ''))
+'''
+
+# Upcoming-event queries filter on date and order by (date, time)
+EVENT_DATE_INDEX_SQL = '''
+    CREATE INDEX IF NOT EXISTS ix_events_date_time
+    ON events(date, time)
+'''
+
+
+def remove_duplicate_events(cursor) -> int:
+    """Delete events sharing a (title, date, time) key, keeping the earliest entry."""
+    cursor.execute('''
+        DELETE FROM events
+        WHERE id NOT IN (
+            SELECT MIN(id) FROM events
+            GROUP BY title, date, IFNULL(time, '')
+        )
+    ''')
+    return cursor.rowcount
+
+
+def ensure_event_key_index(cursor):
+    """Create the unique event key index, first removing duplicates that would block it."""
+    try:
+        cursor.execute(EVENT_KEY_INDEX_SQL)
+    except sqlite3.IntegrityError:
+        removed = remove_duplicate_events(cursor)
+        logger.warning(f"Removed {removed} duplicate events to build the unique event key index")
+        cursor.execute(EVENT_KEY_INDEX_SQL)
+
+
+def ensure_event_indexes(cursor):
+    """Create the indexes on the events table."""
+    cursor.execute(EVENT_DATE_INDEX_SQL)
+    ensure_event_key_index(cursor)
+
+
+# Validators and extracted events per scraped listing page; entries are
+# only reused by the parser version that produced them
+PAGE_CACHE_TABLE_SQL = '''
+    CREATE TABLE IF NOT EXISTS page_cache (
+        url TEXT PRIMARY KEY,
+        etag TEXT,
+        last_modified TEXT,
+        content_hash TEXT,
+        row_count INTEGER,
+        events TEXT,
+        parser_version INTEGER NOT NULL DEFAULT 0,
+        fetched_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+
+
+def ensure_page_cache_table(cursor):
+    """Create the page cache table, replacing one with an older layout."""
+    cursor.execute("SELECT name FROM pragma_table_info('page_cache')")
+    columns = {name for name, in cursor.fetchall()}
+    if columns and 'parser_version' not in columns:
+        # The cache only holds data derived from the site, so it is
+        # rebuilt rather than migrated
+        cursor.execute('DROP TABLE page_cache')
+        logger.info("Dropped page cache with an outdated layout")
+    cursor.execute(PAGE_CACHE_TABLE_SQL)
@@ -13,6 +13,21 @@ from datetime import datetime
 from typing import Dict, List, Tuple, Optional
 
 
+_WS_RE = re.compile(r'\s+')
+
+
+def _collapse_ws(text: str) -> str:
+    """
+    Collapse whitespace runs to single spaces
+    
+    Printable ASCII strings without double spaces (the common case for
+    scraped fields) are returned as-is without invoking the regex engine.
+    """
+    if text.isascii() and text.isprintable() and '  ' not in text:
+        return text
+    return _WS_RE.sub(' ', text)
+
+
 class ValidationError(Exception):
     """Custom exception for validation errors"""
     pass
@@ -56,7 +71,7 @@ class EventValidator:
             cleaned = cleaned[:200]
         
         # Remove excessive whitespace
-        cleaned = re.sub(r'\s+', ' ', cleaned)
+        cleaned = _collapse_ws(cleaned)
         
         return True, cleaned
     
@@ -149,7 +164,7 @@ class EventValidator:
         cleaned = location.strip()
         
         # Remove excessive whitespace
-        cleaned = re.sub(r'\s+', ' ', cleaned)
+        cleaned = _collapse_ws(cleaned)
         
         # Check maximum length
         if len(cleaned) > 200:
@@ -205,7 +220,7 @@ class EventValidator:
         cleaned = description.strip()
         
         # Remove excessive whitespace
-        cleaned = re.sub(r'\s+', ' ', cleaned)
+        cleaned = _collapse_ws(cleaned)
         
         # Check maximum length (for database storage)
         if len(cleaned) > 5000:
@@ -283,8 +298,72 @@ class EventValidator:
 class DuplicateDetector:
     """Enhanced duplicate detection for events"""
     
-    def __init__(self, db_connection):
+    def __init__(self, db_connection, preload: bool = False):
         self.conn = db_connection
+        
+        # In-memory indexes of existing events, populated by preload()
+        self._ids_by_link = None
+        self._ids_by_title_date = None
+        self._titles_by_date = None
+        
+        if preload:
+            self.preload()
+    
+    def preload(self):
+        """
+        Load existing events once so checks become dictionary lookups
+        instead of one set of queries per event
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT id, title, date, link FROM events ORDER BY id")
+        
+        self._ids_by_link = {}
+        self._ids_by_title_date = {}
+        self._titles_by_date = {}
+        
+        for event_id, title, date, link in cursor.fetchall():
+            self._index_event(event_id, title, date, link)
+    
+    def add(self, event_data: Dict, event_id: Optional[int] = None):
+        """
+        Register an event about to be saved so later events in the same
+        batch are checked against it (no-op unless preloaded)
+        """
+        if self._ids_by_link is None:
+            return
+        self._index_event(
+            event_id,
+            event_data.get('title'),
+            event_data.get('date'),
+            event_data.get('link')
+        )
+    
+    def _index_event(self, event_id, title, date, link):
+        """Add one event to the in-memory indexes, keeping the first id seen"""
+        if link:
+            self._ids_by_link.setdefault(link, event_id)
+        if title:
+            self._ids_by_title_date.setdefault((title, date), event_id)
+            self._titles_by_date.setdefault(date, []).append((event_id, title.lower()))
+    
+    def link_belongs_to_other(self, link: Optional[str], event_id: Optional[int]) -> bool:
+        """
+        Check whether a link is already used by an event other than event_id
+        
+        Events added to a preloaded detector without an id count as other
+        events, since their rows do not exist yet.
+        """
+        if not link:
+            return False
+        if self._ids_by_link is not None:
+            return link in self._ids_by_link and self._ids_by_link[link] != event_id
+        
+        cursor = self.conn.cursor()
+        cursor.execute(
+            "SELECT 1 FROM events WHERE link = ? AND id IS NOT ?",
+            (link, event_id)
+        )
+        return cursor.fetchone() is not None
     
     def is_duplicate(self, event_data: Dict) -> Tuple[bool, Optional[int], str]:
         """
@@ -293,6 +372,9 @@ class DuplicateDetector:
         Returns:
             Tuple of (is_duplicate, existing_event_id, reason)
         """
+        if self._ids_by_link is not None:
+            return self._is_duplicate_preloaded(event_data)
+        
         cursor = self.conn.cursor()
         
         # Method 1: Exact link match (most reliable)
@@ -333,6 +415,34 @@ class DuplicateDetector:
         
         return False, None, ""
     
+    def _is_duplicate_preloaded(self, event_data: Dict) -> Tuple[bool, Optional[int], str]:
+        """
+        Same checks as is_duplicate, answered from the preloaded indexes
+        
+        Returns:
+            Tuple of (is_duplicate, existing_event_id, reason)
+        """
+        # Method 1: Exact link match (most reliable)
+        if 'link' in event_data and event_data['link'] in self._ids_by_link:
+            return True, self._ids_by_link[event_data['link']], "Exact link match"
+        
+        if 'title' not in event_data or 'date' not in event_data:
+            return False, None, ""
+        
+        # Method 2: Title + Date match
+        key = (event_data['title'], event_data['date'])
+        if key in self._ids_by_title_date:
+            return True, self._ids_by_title_date[key], "Title and date match"
+        
+        # Method 3: Fuzzy title match on same date (similarity check)
+        title = event_data['title'].lower()
+        for event_id, existing_title in self._titles_by_date.get(event_data['date'], ()):
+            similarity = self._calculate_similarity(title, existing_title)
+            if similarity > 0.85:  # 85% similarity threshold
+                return True, event_id, f"High similarity match ({similarity:.0%})"
+        
+        return False, None, ""
+    
     def _calculate_similarity(self, str1: str, str2: str) -> float:
         """
         Calculate similarity between two strings using Levenshtein distance
@@ -347,36 +457,81 @@ class DuplicateDetector:
         if len(str1) == 0 or len(str2) == 0:
             return 0.0
         
-        # Create distance matrix
+        max_len = max(len(str1), len(str2))
+        
+        # Bit-parallel path when the shorter string fits in one 64-bit word
+        if min(len(str1), len(str2)) <= 64:
+            if len(str1) > len(str2):
+                str1, str2 = str2, str1
+            return 1 - (self._myers_distance(str1, str2) / max_len)
+        
+        # Only two rows of the distance matrix are needed at a time
         rows = len(str1) + 1
         cols = len(str2) + 1
-        distance = [[0 for _ in range(cols)] for _ in range(rows)]
-        
-        # Initialize first row and column
-        for i in range(1, rows):
-            distance[i][0] = i
-        for j in range(1, cols):
-            distance[0][j] = j
+        prev = list(range(cols))
+        curr = [0] * cols
         
         # Calculate distances
         for i in range(1, rows):
+            curr[0] = i
             for j in range(1, cols):
                 if str1[i-1] == str2[j-1]:
                     cost = 0
                 else:
                     cost = 1
                 
-                distance[i][j] = min(
-                    distance[i-1][j] + 1,      # deletion
-                    distance[i][j-1] + 1,      # insertion
-                    distance[i-1][j-1] + cost  # substitution
+                curr[j] = min(
+                    prev[j] + 1,        # deletion
+                    curr[j-1] + 1,      # insertion
+                    prev[j-1] + cost    # substitution
                 )
+            prev, curr = curr, prev
         
         # Calculate similarity ratio
-        max_len = max(len(str1), len(str2))
-        similarity = 1 - (distance[rows-1][cols-1] / max_len)
+        similarity = 1 - (prev[cols-1] / max_len)
         
         return similarity
+    
+    @staticmethod
+    def _myers_distance(pattern: str, text: str) -> int:
+        """
+        Levenshtein distance using Myers' bit-vector algorithm
+        
+        Each bit of the VP/VN vectors holds one DP cell of the current
+        column, so a whole column is updated with a few bitwise operations.
+        
+        Returns:
+            Edit distance between pattern and text
+        """
+        # Bitmask of positions in pattern for each character
+        peq = {}
+        for i, char in enumerate(pattern):
+            peq[char] = peq.get(char, 0) | (1 << i)
+        
+        mask = (1 << len(pattern)) - 1
+        high_bit = 1 << (len(pattern) - 1)
+        vp = mask
+        vn = 0
+        score = len(pattern)
+        
+        for char in text:
+            eq = peq.get(char, 0)
+            xv = eq | vn
+            xh = (((eq & vp) + vp) ^ vp) | eq
+            hp = vn | ~(xh | vp)
+            hn = vp & xh
+            
+            if hp & high_bit:
+                score += 1
+            elif hn & high_bit:
+                score -= 1
+            
+            hp = (hp << 1) | 1
+            hn = hn << 1
+            vp = (hn | ~(xv | hp)) & mask
+            vn = hp & xv & mask
+        
+        return score
 
 
 def validate_batch_events(events: List[Dict]) -> Tuple[List[Dict], List[Dict], Dict]:
@@ -0,0 +1,109 @@
+"""
+Page Cache for Incremental Scraping
+
+Remembers, per listing page URL:
+- HTTP validators (ETag / Last-Modified) for conditional GET requests
+- A hash of the page body, for servers that ignore conditional requests
+- The events extracted from the page, so unchanged pages are not re-parsed
+
+The page_cache table is created by database.schema.ensure_page_cache_table.
+"""
+
+import hashlib
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.append(str(Path(__file__).parent.parent))
+from database.error_handling import DatabaseTransaction, logger
+
+
+class PageCache:
+    """Stores validators and extracted events for scraped pages"""
+
+    def __init__(self, db_connection, parser_version: int):
+        self.conn = db_connection
+        # Entries written by another version of the page parser are ignored
+        self.parser_version = parser_version
+
+    def load(self) -> Dict[str, Dict]:
+        """
+        Load all cached pages
+
+        Returns:
+            Dictionary of url -> cache entry
+        """
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            SELECT url, etag, last_modified, content_hash, row_count, events
+            FROM page_cache
+            WHERE parser_version = ?
+        ''', (self.parser_version,))
+
+        return {
+            url: {
+                'etag': etag,
+                'last_modified': last_modified,
+                'content_hash': content_hash,
+                'row_count': row_count,
+                'events': json.loads(events) if events else []
+            }
+            for url, etag, last_modified, content_hash, row_count, events in cursor.fetchall()
+        }
+
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict]) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers for a cached page"""
+        headers = {}
+        if entry:
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    @staticmethod
+    def content_hash(content: bytes) -> str:
+        """Hash a page body"""
+        return hashlib.sha256(content).hexdigest()
+
+    def is_unchanged(self, entry: Optional[Dict], response) -> bool:
+        """
+        Check whether a response can be answered from the cache entry
+
+        Returns:
+            True for 304 Not Modified or a body identical to the cached one
+        """
+        if entry is None:
+            return False
+        if response.status_code == 304:
+            return True
+        return self.content_hash(response.content) == entry['content_hash']
+
+    def make_entry(self, url: str, response, row_count: int, events: List[Dict]) -> tuple:
+        """Build a row for save() from a freshly parsed response"""
+        return (
+            url,
+            response.headers.get('ETag'),
+            response.headers.get('Last-Modified'),
+            self.content_hash(response.content),
+            row_count,
+            json.dumps(events),
+            self.parser_version
+        )
+
+    def save(self, entries: List[tuple]):
+        """Store freshly parsed pages, replacing older entries"""
+        if not entries:
+            return
+
+        with DatabaseTransaction(self.conn, "Update page cache") as cursor:
+            cursor.executemany('''
+                INSERT OR REPLACE INTO page_cache
+                (url, etag, last_modified, content_hash, row_count, events,
+                 parser_version, fetched_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, DATETIME('now'))
+            ''', entries)
+
+        logger.debug(f"Cached {len(entries)} scraped pages")
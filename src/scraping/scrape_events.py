@@ -1,12 +1,19 @@
 import requests
-from bs4 import BeautifulSoup
+import requests.adapters
+import lxml.html
+from lxml import etree
 import sqlite3
-from datetime import datetime
+from datetime import datetime, timezone
 import time
 import sys
+import io
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 from database.db_utils import get_db_connection
+from database.schema import ensure_event_indexes, ensure_page_cache_table, remove_duplicate_events
+from scraping.page_cache import PageCache
 from database.validation import EventValidator, DuplicateDetector, validate_batch_events
 from database.error_handling import (
     with_error_handling,
@@ -19,6 +26,35 @@ from database.error_handling import (
     ValidationError
 )
 
+def _has_class(name):
+    """XPath predicate matching `name` as a whole token of the class attribute"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+# Selectors are compiled once and evaluated by libxml2 for every row
+XP_EVENT_ROWS = etree.XPath(f"//*[{_has_class('views-row')}]")
+XP_TITLE_LINK = etree.XPath(f".//*[{_has_class('field-title')}]//a")
+XP_DESCRIPTION = etree.XPath(f".//*[{_has_class('field-body')}]")
+XP_DATE_TIME = etree.XPath(f".//*[{_has_class('views-field-field-dates-value')}]//time")
+XP_LOCATION = etree.XPath(f".//*[{_has_class('field-location')}]")
+
+def _first(elements):
+    """Return the first matched element (document order) or None"""
+    return elements[0] if elements else None
+
+# Pages are fetched concurrently in batches; the pool size caps load on the site
+PAGE_BATCH_SIZE = 8
+MAX_CONCURRENT_REQUESTS = 4
+REQUEST_DELAY = 0.25
+EVENTS_PER_PAGE = 10
+
+# Bump whenever parse_event_row changes what it extracts, so pages cached
+# by an older parser are parsed again even if their body is unchanged
+PARSER_VERSION = 1
+
+def local_date_str():
+    """Today's local date as YYYY-MM-DD, the cutoff between past and upcoming events."""
+    return datetime.now().strftime('%Y-%m-%d')
+
 @with_error_handling("Cleanup past events")
 def cleanup_past_events():
     """Remove past events and duplicates from the database."""
@@ -26,48 +62,17 @@ def cleanup_past_events():
     
     try:
         with DatabaseTransaction(conn, "Cleanup past events") as cursor:
-            # Get count of past events before deletion
-            cursor.execute('SELECT COUNT(*) FROM events WHERE date < DATE("now")')
-            past_events_count = cursor.fetchone()[0]
-            
-            # Delete past events
-            cursor.execute('DELETE FROM events WHERE date < DATE("now")')
-            
-            # Get count of duplicates
-            cursor.execute('''
-                WITH duplicates AS (
-                    SELECT MIN(id) as keep_id, title, date, time
-                    FROM events 
-                    GROUP BY title, date, time
-                    HAVING COUNT(*) > 1
-                )
-                SELECT COUNT(*) FROM events e
-                WHERE EXISTS (
-                    SELECT 1 FROM duplicates d
-                    WHERE e.title = d.title 
-                    AND e.date = d.date 
-                    AND COALESCE(e.time, '') = COALESCE(d.time, '')
-                    AND e.id != d.keep_id
-                )
-            ''')
-            duplicate_count = cursor.fetchone()[0]
+            # Delete past events, using the scraper's local-date cutoff so
+            # today's events are never removed and re-inserted; rowcount
+            # gives the number removed
+            cursor.execute('DELETE FROM events WHERE date < ?', (local_date_str(),))
+            past_events_count = cursor.rowcount
             
             # Remove duplicates, keeping the earliest entry
-            cursor.execute('''
-                DELETE FROM events
-                WHERE id IN (
-                    SELECT e.id FROM events e
-                    INNER JOIN (
-                        SELECT title, date, time, MIN(id) as keep_id
-                        FROM events 
-                        GROUP BY title, date, time
-                        HAVING COUNT(*) > 1
-                    ) d ON e.title = d.title 
-                        AND e.date = d.date 
-                        AND COALESCE(e.time, '') = COALESCE(d.time, '')
-                    WHERE e.id != d.keep_id
-                )
-            ''')
+            duplicate_count = remove_duplicate_events(cursor)
+            
+            # Duplicates are gone, so the key index can be built safely
+            ensure_event_indexes(cursor)
             
             # Delete orphaned category associations
             cursor.execute('''
@@ -90,6 +95,7 @@ def cleanup_past_events():
 
 from datetime import datetime
 
+@lru_cache(maxsize=4096)
 def parse_datetime(datetime_str):
     """Parse the datetime string from the website into separate date and time."""
     if not datetime_str:
@@ -113,108 +119,238 @@ def parse_datetime(datetime_str):
         print(f"Error parsing datetime {datetime_str}: {e}")
         return None, None
 
+def create_session():
+    """Create an HTTP session whose keep-alive connections are reused across pages"""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=MAX_CONCURRENT_REQUESTS
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    # Ask for compressed bodies explicitly; listing pages are mostly markup
+    session.headers['Accept-Encoding'] = 'gzip, deflate'
+    return session
+
+def fetch_page(url, session, headers=None):
+    """Fetch a single page of events, sending any conditional request headers"""
+    # Add a delay before each request to be polite
+    time.sleep(REQUEST_DELAY)
+    response = session.get(url, headers=headers, timeout=10)
+    response.raise_for_status()
+    return response
+
+def declared_charset(response):
+    """Charset from the response's Content-Type header, or None if it declares none"""
+    # requests falls back to ISO-8859-1 for text/* without a charset, which
+    # would override a <meta charset> in the page, so only trust a real one
+    if 'charset=' in response.headers.get('Content-Type', '').lower():
+        return response.encoding
+    return None
+
+def parse_event_rows(content, encoding=None):
+    """Parse a page body and return its '.views-row' elements
+
+    `encoding` is the charset declared in the HTTP headers; without one the
+    parser detects it from the document itself (<meta charset> or BOM).
+    """
+    parser = None
+    if encoding:
+        try:
+            parser = lxml.html.HTMLParser(encoding=encoding)
+        except LookupError:
+            logger.warning(f"Unknown page encoding {encoding!r}, detecting it from the page")
+    try:
+        tree = lxml.html.fromstring(content, parser=parser)
+    except etree.ParserError:
+        # Empty document
+        return []
+    return XP_EVENT_ROWS(tree)
+
+def extract_page_events(event_rows, today_str):
+    """Extract upcoming events from a page's rows"""
+    page_events = []
+    # Buffer debug output and write it once per page instead of per line
+    out = io.StringIO()
+    for row in event_rows:
+        try:
+            event = parse_event_row(row, today_str)
+            if event is None:
+                continue
+
+            page_events.append(event)
+
+            # Debug: Print each event as it's found
+            description = event['description']
+            out.write(
+                f"\nFound event:\n"
+                f"Title: {event['title']}\n"
+                f"Date: {event['date']}\n"
+                f"Time: {event['time']}\n"
+                f"Location: {event['location']}\n"
+                f"Link: {event['link']}\n"
+                f"Description length: {len(description) if description else 0} chars\n"
+            )
+
+        except Exception as e:
+            logger.warning(f"Error processing event: {e}")
+            out.write(f"Error processing event: {e}\n")
+            continue
+
+    sys.stdout.write(out.getvalue())
+    return page_events
+
+def parse_event_row(row, today_str):
+    """Extract an event from a single '.views-row' element.
+
+    Returns None for rows without a title, without a valid date, or dated
+    before `today_str` (YYYY-MM-DD).
+    """
+    title_elem = _first(XP_TITLE_LINK(row))
+    if title_elem is None:
+        return None
+
+    # Parse date and time first so past rows are dropped before the
+    # title, description and location text is extracted
+    date_elem = _first(XP_DATE_TIME(row))
+    datetime_str = date_elem.get('datetime') if date_elem is not None else None
+    event_date, event_time = parse_datetime(datetime_str)
+    
+    # Skip events without a valid date or past events; ISO dates sort
+    # lexicographically, so no parsing is needed to compare them
+    if not event_date or event_date < today_str:
+        return None
+
+    title = title_elem.text_content().strip()
+    
+    # Get full description
+    description = _first(XP_DESCRIPTION(row))
+    description = description.text_content().strip() if description is not None else None
+    
+    # Get location
+    location = _first(XP_LOCATION(row))
+    location = location.text_content().strip() if location is not None else None
+    
+    # Get link
+    link = title_elem.get('href')
+    if link:
+        link = f"https://www.olympic.edu{link}"
+
+    return {
+        'title': title,
+        'description': description,
+        'date': event_date,
+        'time': event_time,
+        'location': location,
+        'link': link
+    }
+
 @with_error_handling("Scrape events")
 def scrape_events():
     base_url = 'https://www.olympic.edu/events-calendar'
     current_page = 0
+    pages_scraped = 0
     events = []
     error_handler = ScrapingErrorHandler(max_retries=3, retry_delay=5)
+    # Read the clock once per scrape rather than once per event row
+    today_str = local_date_str()
+
+    session = create_session()
+
+    # HTTP validators and extracted events from previous runs
+    conn = get_db_connection()
+    with DatabaseTransaction(conn, "Prepare page cache") as cursor:
+        ensure_page_cache_table(cursor)
+    page_cache = PageCache(conn, PARSER_VERSION)
+    cached_pages = page_cache.load()
+    cache_updates = []
+    pages_unchanged = 0
 
     def scrape_page(url):
-        """Scrape a single page of events"""
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        return BeautifulSoup(response.text, 'html.parser')
+        """Fetch a page with retry logic, returning None if all attempts fail"""
+        headers = PageCache.conditional_headers(cached_pages.get(url))
+        return error_handler.scrape_with_retry(fetch_page, url, session, headers)
 
     try:
-        while True:
-            url = f"{base_url}?page={current_page}"
-            print(f"\nFetching events from: {url}")
-            
-            # Add a delay between requests to be polite
-            time.sleep(1)
-            
-            # Use error handler with retry logic
-            soup = error_handler.scrape_with_retry(scrape_page, url)
-            
-            if soup is None:
-                logger.warning(f"Failed to scrape page {current_page}, stopping")
-                break
-            
-            event_rows = soup.select('.views-row')
-            
-            if not event_rows:
-                print("No more events found, stopping.")
-                logger.info(f"Scraping complete: {len(events)} events found")
-                break
-
-            for row in event_rows:
-                try:
-                    title_elem = row.select_one('.field-title a')
-                    if not title_elem:
-                        continue
-
-                    title = title_elem.text.strip()
-                    
-                    # Get full description
-                    description = row.select_one('.field-body')
-                    description = description.text.strip() if description else None
-                    
-                    # Parse date and time
-                    date_elem = row.select_one('.views-field-field-dates-value time')
-                    datetime_str = date_elem.get('datetime') if date_elem else None
-                    event_date, event_time = parse_datetime(datetime_str)
-                    
-                    # Skip events without a valid date or past events
-                    if not event_date or datetime.strptime(event_date, '%Y-%m-%d') < datetime.now():
-                        continue
-                    
-                    # Get location
-                    location = row.select_one('.field-location')
-                    location = location.text.strip() if location else None
-                    
-                    # Get link
-                    link = title_elem.get('href')
-                    if link:
-                        link = f"https://www.olympic.edu{link}"
-
-                    events.append({
-                        'title': title,
-                        'description': description,
-                        'date': event_date,
-                        'time': event_time,
-                        'location': location,
-                        'link': link
-                    })
-
-                    # Debug: Print each event as it's found
-                    print(f"\nFound event:")
-                    print(f"Title: {title}")
-                    print(f"Date: {event_date}")
-                    print(f"Time: {event_time}")
-                    print(f"Location: {location}")
-                    print(f"Link: {link}")
-                    print(f"Description length: {len(description) if description else 0} chars")
-
-                except Exception as e:
-                    logger.warning(f"Error processing event: {e}")
-                    print(f"Error processing event: {e}")
-                    continue
+        with session, ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+            done = False
+            while not done:
+                # The last page is unknown, so fetch pages in concurrent batches
+                # and stop at the first page that comes back short or empty
+                urls = [
+                    f"{base_url}?page={page}"
+                    for page in range(current_page, current_page + PAGE_BATCH_SIZE)
+                ]
+                print(f"\nFetching events from pages {current_page}-{current_page + PAGE_BATCH_SIZE - 1}")
+
+                # executor.map yields results in page order
+                for url, response in zip(urls, executor.map(scrape_page, urls)):
+                    if response is None:
+                        logger.warning(f"Failed to scrape page {current_page}, stopping")
+                        done = True
+                        break
+
+                    cached = cached_pages.get(url)
+                    if page_cache.is_unchanged(cached, response):
+                        # Not modified: reuse the cached events, dropping any
+                        # that have passed since they were cached
+                        row_count = cached['row_count']
+                        page_events = [e for e in cached['events'] if e['date'] >= today_str]
+                    else:
+                        event_rows = parse_event_rows(response.content, declared_charset(response))
+                        row_count = len(event_rows)
+                        page_events = None
+
+                    if not row_count:
+                        print("No more events found, stopping.")
+                        logger.info(f"Scraping complete: {len(events)} events found")
+                        done = True
+                        break
+
+                    pages_scraped += 1
 
-            if len(event_rows) < 10:  # Assuming pagination shows 10 events per page
-                print("Reached last page, stopping.")
-                break
+                    if page_events is None:
+                        print(f"\nProcessing events from: {url}")
+                        page_events = extract_page_events(event_rows, today_str)
+                        cache_updates.append(
+                            page_cache.make_entry(url, response, row_count, page_events)
+                        )
+                    else:
+                        print(f"\nPage unchanged, reusing {len(page_events)} cached events: {url}")
+                        pages_unchanged += 1
 
-            current_page += 1
+                    events.extend(page_events)
+
+                    if row_count < EVENTS_PER_PAGE:
+                        print("Reached last page, stopping.")
+                        done = True
+                        break
+
+                    current_page += 1
+
+        page_cache.save(cache_updates)
 
         # Save failed URLs if any
         if error_handler.get_failed_urls():
             error_handler.save_failed_urls()
 
+        # Drop events repeated across pagination boundaries; the first
+        # occurrence (the next date for a recurring link) is kept
+        unique_events = {}
+        for event in events:
+            key = event['link'] or (event['title'], event['date'], event['time'])
+            unique_events.setdefault(key, event)
+        duplicates_removed = len(events) - len(unique_events)
+        events = list(unique_events.values())
+        if duplicates_removed:
+            logger.info(f"Removed {duplicates_removed} duplicate events within scrape batch")
+
         print(f"\nTotal events scraped: {len(events)}")
         log_operation_stats("Scraping", {
             "Total events": len(events),
-            "Pages scraped": current_page + 1,
+            "Batch duplicates removed": duplicates_removed,
+            "Pages scraped": pages_scraped,
+            "Pages unchanged": pages_unchanged,
             "Failed URLs": len(error_handler.get_failed_urls())
         })
         
@@ -224,6 +360,8 @@ def scrape_events():
         logger.error(f"Critical error scraping events: {str(e)}")
         print(f"\nError scraping events: {str(e)}")
         raise ScrapingError(f"Failed to scrape events: {str(e)}")
+    finally:
+        conn.close()
 
 @with_error_handling("Save events to database")
 def save_events_to_db(events):
@@ -235,11 +373,6 @@ def save_events_to_db(events):
     conn = get_db_connection()
     recovery_mgr = RecoveryManager(conn)
     
-    # Create backup before major changes
-    logger.info("Creating database backup before saving events")
-    backup_path = recovery_mgr.create_backup()
-    print(f"Database backup created: {backup_path.name}")
-    
     try:
         # Validate events before saving
         print("\nValidating events...")
@@ -263,65 +396,106 @@ def save_events_to_db(events):
         print(f"\n{len(valid_events)} events passed validation")
         logger.info(f"{len(valid_events)} events passed validation")
         
-        # Check for duplicates
-        duplicate_detector = DuplicateDetector(conn)
+        # Check for duplicates against existing events loaded once up front
+        duplicate_detector = DuplicateDetector(conn, preload=True)
         
-        events_added = 0
-        events_updated = 0
+        # Load the keys of upcoming events once instead of relying on
+        # per-row IntegrityErrors to find existing events; "upcoming" uses
+        # the same local date as the scraper's past-event filter
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT title, date, COALESCE(time, ''), id
+            FROM events
+            WHERE date >= ?
+        ''', (local_date_str(),))
+        existing_keys = {(title, date, time): event_id for title, date, time, event_id in cursor}
+        
+        # Timestamp for every row written by this save, read once; SQLite's
+        # DATETIME('now') is UTC, so match it
+        now_str = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+        
+        # Partition events into inserts and updates before touching the table
+        new_rows = []
+        update_rows = []
         events_skipped = 0
         
+        for event in valid_events:
+            # Built once per event and reused for both the lookup and the set
+            key = (event['title'], event['date'], event.get('time') or '')
+            
+            if key in existing_keys:
+                # Keys added earlier in this batch have no id yet; the upsert
+                # also sets the link, which must stay unique
+                event_id = existing_keys[key]
+                if event_id is None:
+                    logger.debug(f"Skipping duplicate event: {event['title']} (repeated in batch)")
+                    events_skipped += 1
+                    continue
+                if duplicate_detector.link_belongs_to_other(event['link'], event_id):
+                    logger.debug(f"Skipping update of {event['title']}: link belongs to another event")
+                    events_skipped += 1
+                    continue
+                
+                rows = update_rows
+                duplicate_detector.add(event, event_id)
+                logger.debug(f"Updating existing event: {event['title']}")
+            else:
+                # Fuzzy check only when the exact key missed
+                is_dup, dup_id, reason = duplicate_detector.is_duplicate(event)
+                if is_dup:
+                    logger.debug(f"Skipping duplicate event: {event['title']} ({reason})")
+                    events_skipped += 1
+                    continue
+                
+                rows = new_rows
+                existing_keys[key] = None  # id assigned on insert
+                duplicate_detector.add(event)
+                logger.debug(f"Adding new event: {event['title']}")
+            
+            # Only events that will be written get a row tuple
+            rows.append((
+                event['title'],
+                event.get('description'),
+                event['date'],
+                event.get('time'),
+                event.get('location'),
+                event['link'],
+                now_str
+            ))
+        
+        events_added = len(new_rows)
+        events_updated = len(update_rows)
+        
+        # Create backup before major changes, if there are any
+        if new_rows or update_rows:
+            logger.info("Creating database backup before saving events")
+            backup_path = recovery_mgr.create_backup()
+            print(f"Database backup created: {backup_path.name}")
+        else:
+            logger.info("No events to add or update, skipping database backup")
+        
+        # All writes share one transaction, so SQLite commits (and syncs) once
         with DatabaseTransaction(conn, "Save events to database") as cursor:
-            for event in valid_events:
-                try:
-                    # Check if this is a duplicate of an existing event
-                    is_dup, dup_id, reason = duplicate_detector.is_duplicate(event)
-                    if is_dup:
-                        logger.debug(f"Skipping duplicate event: {event['title']} ({reason})")
-                        events_skipped += 1
-                        continue
-                    
-                    # Try to insert the event
-                    cursor.execute('''
-                        INSERT INTO events (title, description, date, time, location, link)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    ''', (
-                        event['title'],
-                        event['description'],
-                        event['date'],
-                        event['time'],
-                        event['location'],
-                        event['link']
-                    ))
-                    events_added += 1
-                    logger.debug(f"Added new event: {event['title']}")
-                    
-                except sqlite3.IntegrityError:
-                    # If event already exists, update it
-                    cursor.execute('''
-                        UPDATE events 
-                        SET description = ?,
-                            location = ?,
-                            link = ?,
-                            last_updated = DATETIME('now')
-                        WHERE title = ? AND date = ? AND (time = ? OR (time IS NULL AND ? IS NULL))
-                    ''', (
-                        event['description'],
-                        event['location'],
-                        event['link'],
-                        event['title'],
-                        event['date'],
-                        event['time'],
-                        event['time']
-                    ))
-                    events_updated += 1
-                    logger.debug(f"Updated existing event: {event['title']}")
+            ensure_event_indexes(cursor)
+            
+            # Upsert on the (title, date, time) key; existing rows only get
+            # their details refreshed
+            cursor.executemany('''
+                INSERT INTO events (title, description, date, time, location, link, last_updated)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(title, date, IFNULL(time, '')) DO UPDATE SET
+                    description = excluded.description,
+                    location = excluded.location,
+                    link = excluded.link,
+                    last_updated = excluded.last_updated
+            ''', new_rows + update_rows)
 
             # Record the scraping in history
             cursor.execute('''
                 INSERT INTO scraping_history 
                 (start_time, end_time, events_scraped, status)
-                VALUES (DATETIME('now'), DATETIME('now'), ?, 'success')
-            ''', (events_added + events_updated,))
+                VALUES (?, ?, ?, 'success')
+            ''', (now_str, now_str, events_added + events_updated))
 
         print(f"\nDatabase update summary:")
         print(f"New events added: {events_added}")
@@ -365,33 +539,39 @@ def save_events_to_db(events):
 
 def view_events():
     conn = get_db_connection()
+    conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
     
     try:
+        # Truncate long descriptions in SQL so only the shown text is fetched
         cursor.execute('''
-            SELECT title, date, time, location, description, link
+            SELECT title, date, time, location,
+                   CASE WHEN length(description) > 200
+                        THEN substr(description, 1, 197) || '...'
+                        ELSE description
+                   END AS description,
+                   link
             FROM events
-            WHERE date >= DATE('now')
+            WHERE date >= ?
             ORDER BY date ASC, time ASC
             LIMIT 10
-        ''')
+        ''', (local_date_str(),))
         
         print("\nUpcoming events (next 10):")
         print("-" * 80)
         
-        for event in cursor.fetchall():
-            title, date, time, location, description, link = event
-            print(f"Title: {title}")
-            print(f"Date: {date}")
-            if time:
-                print(f"Time: {time}")
-            if location:
-                print(f"Location: {location}")
-            if description:
-                # Truncate description if it's too long
-                desc = description if len(description) <= 200 else description[:197] + "..."
-                print(f"Description: {desc}")
-            print(f"Link: {link}")
+        # The LIMIT fits in one fetchmany() batch
+        cursor.arraysize = 10
+        for event in cursor.fetchmany():
+            print(f"Title: {event['title']}")
+            print(f"Date: {event['date']}")
+            if event['time']:
+                print(f"Time: {event['time']}")
+            if event['location']:
+                print(f"Location: {event['location']}")
+            if event['description']:
+                print(f"Description: {event['description']}")
+            print(f"Link: {event['link']}")
             print("-" * 80)
             
     finally:
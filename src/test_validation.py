@@ -3,68 +3,73 @@ Test script to verify data validation and error handling system
 """
 import sys
 from pathlib import Path
+from types import MappingProxyType
 sys.path.append(str(Path(__file__).parent.parent))
 
 from database.validation import EventValidator, DuplicateDetector, validate_batch_events
 from database.error_handling import logger
 
+# Test data with various issues; read-only since the validator never
+# mutates its input, so the same payload is reused on every run
+_TEST_EVENTS = (
+    MappingProxyType({
+        'title': 'Valid Event',
+        'date': '2025-12-15',
+        'time': '14:00',
+        'location': 'Building 1, Room 101',
+        'link': 'https://www.olympic.edu/event/123',
+        'description': 'This is a properly formatted event with all required fields and sufficient detail.'
+    }),
+    MappingProxyType({
+        'title': '',  # Invalid: empty title
+        'date': '2025-12-15',
+        'time': '14:00',
+        'location': 'Building 1, Room 101',
+        'link': 'https://www.olympic.edu/event/124',
+        'description': 'Missing title event'
+    }),
+    MappingProxyType({
+        'title': 'Invalid Date Event',
+        'date': '2025-13-45',  # Invalid: bad date format
+        'time': '14:00',
+        'location': 'Building 1, Room 101',
+        'link': 'https://www.olympic.edu/event/125',
+        'description': 'This event has an invalid date'
+    }),
+    MappingProxyType({
+        'title': 'Past Event',
+        'date': '2020-01-01',  # Invalid: past date
+        'time': '14:00',
+        'location': 'Building 1, Room 101',
+        'link': 'https://www.olympic.edu/event/126',
+        'description': 'This event is in the past'
+    }),
+    MappingProxyType({
+        'title': 'Invalid Time Event',
+        'date': '2025-12-15',
+        'time': '25:99',  # Invalid: bad time format
+        'location': 'Building 1, Room 101',
+        'link': 'https://www.olympic.edu/event/127',
+        'description': 'This event has invalid time'
+    }),
+    MappingProxyType({
+        'title': '   Extra   Whitespace   Event   ',  # Should be cleaned
+        'date': '2025-12-16',
+        'time': '10:00',
+        'location': '  Building 2  ',
+        'link': 'https://www.olympic.edu/event/128',
+        'description': '   This has extra whitespace   '
+    }),
+)
+
+
 def test_validation():
     """Test event validation with various scenarios"""
     print("=" * 60)
     print("Testing Event Validation System")
     print("=" * 60)
     
-    # Test data with various issues
-    test_events = [
-        {
-            'title': 'Valid Event',
-            'date': '2025-12-15',
-            'time': '14:00',
-            'location': 'Building 1, Room 101',
-            'link': 'https://www.olympic.edu/event/123',
-            'description': 'This is a properly formatted event with all required fields and sufficient detail.'
-        },
-        {
-            'title': '',  # Invalid: empty title
-            'date': '2025-12-15',
-            'time': '14:00',
-            'location': 'Building 1, Room 101',
-            'link': 'https://www.olympic.edu/event/124',
-            'description': 'Missing title event'
-        },
-        {
-            'title': 'Invalid Date Event',
-            'date': '2025-13-45',  # Invalid: bad date format
-            'time': '14:00',
-            'location': 'Building 1, Room 101',
-            'link': 'https://www.olympic.edu/event/125',
-            'description': 'This event has an invalid date'
-        },
-        {
-            'title': 'Past Event',
-            'date': '2020-01-01',  # Invalid: past date
-            'time': '14:00',
-            'location': 'Building 1, Room 101',
-            'link': 'https://www.olympic.edu/event/126',
-            'description': 'This event is in the past'
-        },
-        {
-            'title': 'Invalid Time Event',
-            'date': '2025-12-15',
-            'time': '25:99',  # Invalid: bad time format
-            'location': 'Building 1, Room 101',
-            'link': 'https://www.olympic.edu/event/127',
-            'description': 'This event has invalid time'
-        },
-        {
-            'title': '   Extra   Whitespace   Event   ',  # Should be cleaned
-            'date': '2025-12-16',
-            'time': '10:00',
-            'location': '  Building 2  ',
-            'link': 'https://www.olympic.edu/event/128',
-            'description': '   This has extra whitespace   '
-        }
-    ]
+    test_events = _TEST_EVENTS
     
     print(f"\nTesting {len(test_events)} events...\n")
     
@@ -1,14 +1,16 @@
 import sys
+from datetime import date
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
-from database.db_utils import get_db_connection
+from database.db_utils import get_readonly_connection
 
-conn = get_db_connection()
+conn = get_readonly_connection()
 cursor = conn.cursor()
 
-cursor.execute('SELECT title, date, time FROM events WHERE date < "2025-11-05"')
+cutoff = date.today().isoformat()
+cursor.execute('SELECT title, date, time FROM events WHERE date < ? ORDER BY date, time', (cutoff,))
 print('Past events:')
-for title, date, time in cursor.fetchall():
-    print(f'{title} on {date} at {time}')
+for title, event_date, time in cursor:
+    print(f'{title} on {event_date} at {time}')
 
-conn.close()
\ No newline at end of file
+conn.close()
@@ -7,14 +7,20 @@ Provides export capabilities for events including:
 - Bulk export with filtering
 """
 
+import atexit
 import csv
+import itertools
+import multiprocessing
+import shutil
 import sys
+import tempfile
 from pathlib import Path
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple
 
 sys.path.append(str(Path(__file__).parent.parent))
-from database.db_utils import get_db_connection
+from database.db_utils import get_readonly_connection
 from database.error_handling import logger, with_error_handling
 
 try:
@@ -22,7 +28,362 @@ try:
     ICAL_AVAILABLE = True
 except ImportError:
     ICAL_AVAILABLE = False
-    logger.warning("icalendar library not installed. iCal export will not be available.")
+
+# iCal files are written by the built-in RFC 5545 serializer below; set this
+# to build them with the icalendar library instead (when it is installed)
+USE_ICALENDAR = False
+
+WRITE_BUFFER_SIZE = 1 << 20
+
+# SQLite's default SQLITE_MAX_VARIABLE_NUMBER before 3.32
+MAX_SQL_VARIABLES = 999
+
+_ICAL_HEADER = (
+    'BEGIN:VCALENDAR\r\n'
+    'VERSION:2.0\r\n'
+    'PRODID:-//Olympic College Event Manager//EN\r\n'
+    'CALSCALE:GREGORIAN\r\n'
+    'METHOD:PUBLISH\r\n'
+    'X-WR-CALDESC:Events from Olympic College Event Manager\r\n'
+    'X-WR-CALNAME:Olympic College Events\r\n'
+)
+_ICAL_FOOTER = 'END:VCALENDAR\r\n'
+
+# One connection per process, opened on first use and shared by all exports
+_connection = None
+
+
+def _get_connection():
+    """Return the module's shared database connection, opening it if needed"""
+    global _connection
+    if _connection is None:
+        _connection = get_readonly_connection()
+        atexit.register(_connection.close)
+    return _connection
+
+
+def _today() -> str:
+    """Today's date (UTC, as SQLite's DATE('now')) for binding into queries"""
+    return datetime.now(timezone.utc).strftime('%Y-%m-%d')
+
+
+# Events share a small set of dates and times, so cache the strptime results
+@lru_cache(maxsize=4096)
+def _parse_date(date_str: str):
+    """Parse a YYYY-MM-DD string into a date"""
+    return datetime.strptime(date_str, '%Y-%m-%d').date()
+
+
+@lru_cache(maxsize=4096)
+def _parse_time(time_str: str):
+    """Parse an HH:MM string into a time"""
+    return datetime.strptime(time_str, '%H:%M').time()
+
+
+def _ical_escape(text: str) -> str:
+    """Escape a TEXT property value (RFC 5545 section 3.3.11)"""
+    return (
+        text.replace('\\', '\\\\')
+        .replace(';', '\\;')
+        .replace(',', '\\,')
+        .replace('\r\n', '\\n')
+        .replace('\n', '\\n')
+        .replace('\r', '\\n')
+    )
+
+
+def _ical_fold(line: str) -> str:
+    """Fold a content line to at most 75 octets per line (RFC 5545 section 3.1)"""
+    if line.isascii():
+        if len(line) <= 75:
+            return line
+        # Continuation lines start with a space, leaving 74 octets of text
+        parts = [line[:75]]
+        parts.extend(line[i:i + 74] for i in range(75, len(line), 74))
+        return '\r\n '.join(parts)
+    
+    # Multi-byte characters must not be split across lines
+    parts = []
+    start = 0
+    size = 0
+    limit = 75
+    for i, char in enumerate(line):
+        char_size = len(char.encode('utf-8'))
+        if size + char_size > limit:
+            parts.append(line[start:i])
+            start = i
+            size = 0
+            limit = 74
+        size += char_size
+    parts.append(line[start:])
+    return '\r\n '.join(parts)
+
+
+@lru_cache(maxsize=4096)
+def _event_span(date_str: str, time_str: Optional[str]):
+    """
+    Start and end of an event
+    
+    Returns:
+        (start, end) datetimes for a one-hour timed event, or dates spanning
+        one day for an all-day event
+    """
+    event_date = _parse_date(date_str)
+    if time_str:
+        start = datetime.combine(event_date, _parse_time(time_str))
+        # Default to 1 hour duration
+        return start, start + timedelta(hours=1)
+    # All-day event; the end date is the next day
+    return event_date, event_date + timedelta(days=1)
+
+
+@lru_cache(maxsize=4096)
+def _ical_time_lines(date_str: str, time_str: Optional[str]):
+    """DTSTART/DTEND content lines for an event's date and optional time"""
+    start, end = _event_span(date_str, time_str)
+    if time_str:
+        return f'DTSTART:{start:%Y%m%dT%H%M%S}', f'DTEND:{end:%Y%m%dT%H%M%S}'
+    return f'DTSTART;VALUE=DATE:{start:%Y%m%d}', f'DTEND;VALUE=DATE:{end:%Y%m%d}'
+
+
+def _full_description(description, event_type):
+    """Prefix the description with the event type if available"""
+    if description and event_type:
+        return f"[{event_type}]\n\n{description}"
+    return description
+
+
+def _emit_event(out: List[str], row: tuple, stamp: str) -> None:
+    """
+    Serialize one event row as a VEVENT block and append it to out
+    
+    Properties are emitted in the same order the icalendar library uses.
+    `stamp` is the preformatted UTC timestamp shared by the whole export.
+    Raises ValueError or TypeError if the row's date/time cannot be parsed.
+    """
+    # Rows whose date/time cannot be parsed are skipped, so check those
+    # before unpacking the rest of the row
+    dtstart, dtend = _ical_time_lines(row[2], row[3])
+    event_id, title, _, time, location, description, link, event_type = row
+    description = _full_description(description, event_type)
+    
+    lines = [
+        'BEGIN:VEVENT',
+        _ical_fold('SUMMARY:' + _ical_escape(title)),
+        dtstart,
+        dtend,
+        'DTSTAMP:' + stamp,
+        f'UID:event-{event_id}@olympic.edu',
+        'SEQUENCE:0',
+    ]
+    if event_type:
+        lines.append(_ical_fold('CATEGORIES:' + _ical_escape(event_type)))
+    lines.append('CREATED:' + stamp)
+    if description:
+        lines.append(_ical_fold('DESCRIPTION:' + _ical_escape(description)))
+    lines.append('LAST-MODIFIED:' + stamp)
+    if location:
+        lines.append(_ical_fold('LOCATION:' + _ical_escape(location)))
+    lines.append('STATUS:CONFIRMED')
+    lines.append('TRANSP:OPAQUE')
+    if link:
+        lines.append(_ical_fold('URL:' + link))
+    if not time:
+        lines.append('X-MICROSOFT-CDO-ALLDAYEVENT:TRUE')
+    lines.append('END:VEVENT\r\n')
+    
+    out.append('\r\n'.join(lines))
+
+
+def _new_calendar():
+    """Create an icalendar Calendar with the export's calendar properties"""
+    cal = Calendar()
+    cal.add('prodid', '-//Olympic College Event Manager//EN')
+    cal.add('version', '2.0')
+    cal.add('calscale', 'GREGORIAN')
+    cal.add('method', 'PUBLISH')
+    cal.add('x-wr-calname', 'Olympic College Events')
+    cal.add('x-wr-caldesc', 'Events from Olympic College Event Manager')
+    return cal
+
+
+def _build_ical_event(row: tuple, stamp: datetime):
+    """
+    Build one event row with the icalendar library
+    
+    Raises ValueError or TypeError if the row's date/time cannot be parsed.
+    """
+    event_id, title, date, time, location, description, link, event_type = row
+    start, end = _event_span(date, time)
+    description = _full_description(description, event_type)
+    all_day = not time
+    
+    event = ICalEvent()
+    
+    # Add basic info
+    event.add('summary', title)
+    event.add('uid', f'event-{event_id}@olympic.edu')
+    event.add('dtstart', start)
+    event.add('dtend', end)
+    if all_day:
+        event.add('x-microsoft-cdo-alldayevent', 'TRUE')
+    
+    # Add optional fields
+    if description:
+        event.add('description', description)
+    
+    if location:
+        event.add('location', location)
+    
+    if link:
+        event.add('url', link)
+    
+    # Add categories
+    if event_type:
+        event.add('categories', [event_type])
+    
+    # Add metadata
+    event.add('dtstamp', stamp)
+    event.add('created', stamp)
+    event.add('last-modified', stamp)
+    event.add('sequence', 0)
+    event.add('status', 'CONFIRMED')
+    event.add('transp', 'OPAQUE')
+    
+    return event
+
+
+def _emit_events(out: List[str], rows, stamp: str) -> int:
+    """Append the VEVENTs for rows to out; return the number of rows seen"""
+    exported = 0
+    for row in rows:
+        exported += 1
+        try:
+            _emit_event(out, row, stamp)
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Failed to parse date/time for event {row[0]}: {e}")
+            # Skip this event if date parsing fails
+            continue
+    return exported
+
+
+def _tags_by_id(conn, today: str, lo: Optional[str] = None, hi: Optional[str] = None) -> Dict[int, str]:
+    """Comma-joined tags per upcoming event, optionally limited to a date shard"""
+    query, params = _shard_query('''
+        SELECT et.event_id, GROUP_CONCAT(et.tag, ', ')
+        FROM event_tags et
+        JOIN events e ON e.id = et.event_id
+        WHERE e.date >= ?
+    ''', [today], lo, hi)
+    return dict(conn.execute(query + ' GROUP BY et.event_id', params))
+
+
+def _write_csv_rows(writer, rows, tags_by_id: Optional[Dict[int, str]]) -> int:
+    """Write rows (plus their tags, if given) to a csv writer; return the count"""
+    exported = 0
+    for row in rows:
+        if tags_by_id is not None:
+            row += (tags_by_id.get(row[0]),)
+        writer.writerow(row)
+        exported += 1
+    return exported
+
+
+def _shard_query(query: str, params: list, lo: Optional[str], hi: Optional[str]):
+    """Restrict a query on events e to the half-open date range [lo, hi)"""
+    params = list(params)
+    if lo is not None:
+        query += ' AND e.date >= ?'
+        params.append(lo)
+    if hi is not None:
+        query += ' AND e.date < ?'
+        params.append(hi)
+    return query, params
+
+
+def _date_shards(conn, query: str, params: list, num_workers: int) -> List[Tuple[Optional[str], Optional[str]]]:
+    """
+    Split the rows matched by query into up to num_workers contiguous date ranges
+    
+    Bounds are the first date of each NTILE bucket of the date-ordered rows,
+    so shards hold similar numbers of rows and dates are never parsed (rows
+    with malformed dates are exported or skipped by the workers as usual).
+    
+    Returns:
+        (lo, hi) bounds for _shard_query, in date order; the outer ends are
+        left open (None) so no row is lost to the split
+    """
+    starts = conn.execute(f'''
+        SELECT MIN(date) FROM (
+            SELECT date, NTILE(?) OVER (ORDER BY date) AS shard
+            FROM ({query})
+        )
+        GROUP BY shard
+        ORDER BY shard
+    ''', [num_workers] + list(params)).fetchall()
+    if not starts:
+        return []
+    # A date spanning several buckets starts only the first of them
+    cuts = list(dict.fromkeys(start for start, in starts))[1:]
+    return list(zip([None] + cuts, cuts + [None]))
+
+
+def _run_shards(worker, conn, query: str, params: list, num_workers: int, args: tuple, tmp_dir: str):
+    """
+    Run worker over the date shards of query in a pool of processes
+    
+    Each worker gets (query, params, lo, hi, *args, shard_path) and returns
+    the number of rows it wrote to shard_path.
+    
+    Returns:
+        Tuple of (total rows, shard paths in date order)
+    """
+    shards = _date_shards(conn, query, params, num_workers)
+    if not shards:
+        return 0, []
+    tasks = [
+        (query, params, lo, hi, *args, str(Path(tmp_dir) / f'shard{i:04d}'))
+        for i, (lo, hi) in enumerate(shards)
+    ]
+    with multiprocessing.Pool(len(tasks)) as pool:
+        counts = pool.map(worker, tasks)
+    return sum(counts), [task[-1] for task in tasks]
+
+
+def _export_csv_shard(task) -> int:
+    """Pool worker: write one date shard of a CSV export, without header"""
+    query, params, lo, hi, include_enhanced, today, shard_path = task
+    conn = get_readonly_connection()
+    try:
+        query, params = _shard_query(query, params, lo, hi)
+        rows = conn.execute(query + ' ORDER BY e.date, e.time', params)
+        tags_by_id = _tags_by_id(conn, today, lo, hi) if include_enhanced else None
+        with open(shard_path, 'w', newline='', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+            return _write_csv_rows(csv.writer(f), rows, tags_by_id)
+    finally:
+        conn.close()
+
+
+def _export_ical_shard(task) -> int:
+    """Pool worker: write the VEVENTs of one date shard of an iCal export"""
+    query, params, lo, hi, stamp, shard_path = task
+    conn = get_readonly_connection()
+    try:
+        query, params = _shard_query(query, params, lo, hi)
+        chunks = []
+        exported = _emit_events(chunks, conn.execute(query + ' ORDER BY e.date, e.time', params), stamp)
+        with open(shard_path, 'wb') as f:
+            f.write(''.join(chunks).encode('utf-8'))
+        return exported
+    finally:
+        conn.close()
+
+
+def _append_files(out, paths: List[str]) -> None:
+    """Copy the files in paths, in order, onto the end of the binary file out"""
+    for path in paths:
+        with open(path, 'rb') as f:
+            shutil.copyfileobj(f, out)
 
 
 @with_error_handling("CSV Export")
@@ -32,7 +393,8 @@ def export_to_csv(
     location: Optional[str] = None,
     date_from: Optional[str] = None,
     date_to: Optional[str] = None,
-    include_enhanced: bool = True
+    include_enhanced: bool = True,
+    num_workers: int = 1
 ) -> int:
     """
     Export events to CSV format
@@ -44,11 +406,13 @@ def export_to_csv(
         date_from: Filter events from date (YYYY-MM-DD)
         date_to: Filter events to date (YYYY-MM-DD)
         include_enhanced: Include enhanced content fields
+        num_workers: Export date ranges in this many processes (1 = in-process)
     
     Returns:
         Number of events exported
     """
-    conn = get_db_connection()
+    today = _today()
+    conn = _get_connection()
     cursor = conn.cursor()
     
     # Build query with filters
@@ -64,12 +428,10 @@ def export_to_csv(
                 e.link,
                 ec.event_type,
                 ec.seo_score,
-                ec.enhanced_description,
-                GROUP_CONCAT(et.tag, ', ') as tags
+                ec.enhanced_description
             FROM events e
             LEFT JOIN enhanced_content ec ON e.id = ec.event_id
-            LEFT JOIN event_tags et ON e.id = et.event_id
-            WHERE e.date >= DATE('now')
+            WHERE e.date >= ?
         '''
     else:
         query = '''
@@ -82,10 +444,10 @@ def export_to_csv(
                 e.description,
                 e.link
             FROM events e
-            WHERE e.date >= DATE('now')
+            WHERE e.date >= ?
         '''
     
-    params = []
+    params = [today]
     
     # Add filters
     if date_from:
@@ -101,20 +463,6 @@ def export_to_csv(
         query += ' AND e.location LIKE ?'
         params.append(f'%{location}%')
     
-    if include_enhanced:
-        query += ' GROUP BY e.id'
-    
-    query += ' ORDER BY e.date, e.time'
-    
-    cursor.execute(query, params)
-    events = cursor.fetchall()
-    
-    if not events:
-        print("No events to export")
-        logger.info("No events matched export criteria")
-        conn.close()
-        return 0
-    
     # Define CSV headers based on what we're exporting
     if include_enhanced:
         fieldnames = [
@@ -126,21 +474,54 @@ def export_to_csv(
             'ID', 'Title', 'Date', 'Time', 'Location', 'Description', 'Link'
         ]
     
-    # Write to CSV
     output_path = Path(output_file)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
     
-    with open(output_path, 'w', newline='', encoding='utf-8') as csvfile:
-        writer = csv.writer(csvfile)
-        writer.writerow(fieldnames)
-        writer.writerows(events)
-    
-    conn.close()
+    if num_workers > 1:
+        # Each worker exports one date range to its own file; the shards are
+        # in date order, so appending them keeps the overall order
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryDirectory(dir=output_path.parent) as tmp_dir:
+            exported, shard_paths = _run_shards(
+                _export_csv_shard, conn, query, params, num_workers,
+                (include_enhanced, today), tmp_dir
+            )
+            if exported:
+                with open(output_path, 'w', newline='', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as csvfile:
+                    csv.writer(csvfile).writerow(fieldnames)
+                    csvfile.flush()
+                    _append_files(csvfile.buffer, shard_paths)
+        if not exported:
+            print("No events to export")
+            logger.info("No events matched export criteria")
+            return 0
+    else:
+        cursor.execute(query + ' ORDER BY e.date, e.time', params)
+        
+        # Peek at the first row instead of materializing the whole result
+        first_row = cursor.fetchone()
+        if first_row is None:
+            print("No events to export")
+            logger.info("No events matched export criteria")
+            return 0
+        
+        # Aggregate tags in a separate query and merge them in by event ID, so
+        # the main query needs no event_tags join or GROUP BY
+        tags_by_id = _tags_by_id(conn, today) if include_enhanced else None
+        
+        # Write to CSV
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        # Stream rows from the cursor straight into the file; a 1 MiB buffer
+        # keeps large exports to a few large writes
+        with open(output_path, 'w', newline='', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(fieldnames)
+            exported = _write_csv_rows(writer, itertools.chain([first_row], cursor), tags_by_id)
     
-    print(f"\n✓ Successfully exported {len(events)} events to {output_file}")
-    logger.info(f"Exported {len(events)} events to CSV: {output_file}")
+    print(f"\n✓ Successfully exported {exported} events to {output_file}")
+    logger.info(f"Exported {exported} events to CSV: {output_file}")
     
-    return len(events)
+    return exported
 
 
 @with_error_handling("iCal Export")
@@ -150,7 +531,8 @@ def export_to_ical(
     event_type: Optional[str] = None,
     location: Optional[str] = None,
     date_from: Optional[str] = None,
-    date_to: Optional[str] = None
+    date_to: Optional[str] = None,
+    num_workers: int = 1
 ) -> int:
     """
     Export events to iCal (.ics) format
@@ -162,17 +544,18 @@ def export_to_ical(
         location: Filter by location
         date_from: Filter events from date (YYYY-MM-DD)
         date_to: Filter events to date (YYYY-MM-DD)
+        num_workers: Export date ranges in this many processes (1 = in-process;
+            ignored for event_ids and the icalendar writer)
     
     Returns:
         Number of events exported
     """
-    if not ICAL_AVAILABLE:
-        print("Error: icalendar library not installed")
-        print("Install with: pip install icalendar")
-        logger.error("Attempted iCal export without icalendar library")
-        return 0
+    use_icalendar = USE_ICALENDAR and ICAL_AVAILABLE
+    if USE_ICALENDAR and not ICAL_AVAILABLE:
+        logger.warning("icalendar library not installed, using the built-in iCal writer")
     
-    conn = get_db_connection()
+    today = _today()
+    conn = _get_connection()
     cursor = conn.cursor()
     
     # Build query
@@ -188,18 +571,12 @@ def export_to_ical(
             ec.event_type
         FROM events e
         LEFT JOIN enhanced_content ec ON e.id = ec.event_id
-        WHERE e.date >= DATE('now')
+        WHERE e.date >= ?
     '''
     
-    params = []
-    
-    # Filter by specific event IDs
-    if event_ids:
-        placeholders = ','.join('?' * len(event_ids))
-        query += f' AND e.id IN ({placeholders})'
-        params.extend(event_ids)
+    params = [today]
     
-    # Add other filters
+    # Add filters
     if date_from:
         query += ' AND e.date >= ?'
         params.append(date_from)
@@ -213,105 +590,115 @@ def export_to_ical(
         query += ' AND e.location LIKE ?'
         params.append(f'%{location}%')
     
-    query += ' ORDER BY e.date, e.time'
-    
-    cursor.execute(query, params)
-    events = cursor.fetchall()
-    
-    if not events:
-        print("No events to export")
-        logger.info("No events matched iCal export criteria")
-        conn.close()
-        return 0
-    
-    # Create calendar
-    cal = Calendar()
-    cal.add('prodid', '-//Olympic College Event Manager//EN')
-    cal.add('version', '2.0')
-    cal.add('calscale', 'GREGORIAN')
-    cal.add('method', 'PUBLISH')
-    cal.add('x-wr-calname', 'Olympic College Events')
-    cal.add('x-wr-caldesc', 'Events from Olympic College Event Manager')
+    # All events share one (UTC) timestamp for their metadata
+    now = datetime.now(timezone.utc)
+    stamp = f'{now:%Y%m%dT%H%M%SZ}'
+    output_path = Path(output_file)
     
-    # Add events to calendar
-    for event_id, title, date, time, loc, desc, link, event_type in events:
-        event = ICalEvent()
-        
-        # Add basic info
-        event.add('summary', title)
-        event.add('uid', f'event-{event_id}@olympic.edu')
-        
-        # Parse date and time
-        try:
-            event_date = datetime.strptime(date, '%Y-%m-%d').date()
+    if num_workers > 1 and not event_ids and not use_icalendar:
+        # Each worker serializes one date range to its own file; the shards
+        # hold bare VEVENTs, so only the calendar wrapper is written here
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryDirectory(dir=output_path.parent) as tmp_dir:
+            exported, shard_paths = _run_shards(
+                _export_ical_shard, conn, query, params, num_workers, (stamp,), tmp_dir
+            )
+            if exported:
+                with open(output_path, 'wb') as f:
+                    f.write(_ICAL_HEADER.encode('utf-8'))
+                    _append_files(f, shard_paths)
+                    f.write(_ICAL_FOOTER.encode('utf-8'))
+        if not exported:
+            print("No events to export")
+            logger.info("No events matched iCal export criteria")
+            return 0
+    else:
+        # Filter by specific event IDs
+        chunk_size = MAX_SQL_VARIABLES - len(params)
+        if not event_ids or len(event_ids) <= chunk_size:
+            if event_ids:
+                placeholders = ','.join('?' * len(event_ids))
+                query += f' AND e.id IN ({placeholders})'
+                params.extend(event_ids)
             
-            if time:
-                # Event with specific time
-                event_time = datetime.strptime(time, '%H:%M').time()
-                start_dt = datetime.combine(event_date, event_time)
-                # Default to 1 hour duration
-                end_dt = start_dt + timedelta(hours=1)
-                
-                event.add('dtstart', start_dt)
-                event.add('dtend', end_dt)
-            else:
-                # All-day event
-                event.add('dtstart', event_date)
-                # For all-day events, end date is the next day
-                event.add('dtend', event_date + timedelta(days=1))
-                event.add('x-microsoft-cdo-alldayevent', 'TRUE')
-        except (ValueError, TypeError) as e:
-            logger.warning(f"Failed to parse date/time for event {event_id}: {e}")
-            # Skip this event if date parsing fails
-            continue
+            query += ' ORDER BY e.date, e.time'
+            cursor.execute(query, params)
+            rows = cursor
+        else:
+            # Too many IDs for one statement: query them in chunks, then restore
+            # the date/time order (NULL times first, as SQLite sorts them)
+            event_ids = list(dict.fromkeys(event_ids))
+            collected = []
+            for start in range(0, len(event_ids), chunk_size):
+                chunk = event_ids[start:start + chunk_size]
+                placeholders = ','.join('?' * len(chunk))
+                cursor.execute(f'{query} AND e.id IN ({placeholders})', params + chunk)
+                collected.extend(cursor)
+            collected.sort(key=lambda row: (row[2], row[3] is not None, row[3] or ''))
+            rows = iter(collected)
         
-        # Add optional fields
-        if desc:
-            # Create description with event type if available
-            full_desc = desc
-            if event_type:
-                full_desc = f"[{event_type}]\n\n{desc}"
-            event.add('description', full_desc)
+        # Peek at the first row instead of materializing the whole result
+        first_row = next(rows, None)
+        if first_row is None:
+            print("No events to export")
+            logger.info("No events matched iCal export criteria")
+            return 0
         
-        if loc:
-            event.add('location', loc)
+        # Add events to calendar, streaming rows from the cursor
+        rows = itertools.chain([first_row], rows)
+        if use_icalendar:
+            exported = 0
+            cal = _new_calendar()
+            for row in rows:
+                exported += 1
+                try:
+                    cal.add_component(_build_ical_event(row, now))
+                except (ValueError, TypeError) as e:
+                    logger.warning(f"Failed to parse date/time for event {row[0]}: {e}")
+                    # Skip this event if date parsing fails
+                    continue
+            content = cal.to_ical()
+        else:
+            chunks = [_ICAL_HEADER]
+            exported = _emit_events(chunks, rows, stamp)
+            chunks.append(_ICAL_FOOTER)
+            content = ''.join(chunks).encode('utf-8')
         
-        if link:
-            event.add('url', link)
+        # Write to file
+        output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        # Add categories
-        if event_type:
-            event.add('categories', [event_type])
-        
-        # Add metadata
-        event.add('dtstamp', datetime.now())
-        event.add('created', datetime.now())
-        event.add('last-modified', datetime.now())
-        event.add('sequence', 0)
-        event.add('status', 'CONFIRMED')
-        event.add('transp', 'OPAQUE')
-        
-        cal.add_component(event)
-    
-    conn.close()
-    
-    # Write to file
-    output_path = Path(output_file)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, 'wb') as f:
+            f.write(content)
     
-    with open(output_path, 'wb') as f:
-        f.write(cal.to_ical())
-    
-    print(f"\n✓ Successfully exported {len(events)} events to {output_file}")
+    print(f"\n✓ Successfully exported {exported} events to {output_file}")
     print(f"\nTo import into your calendar:")
     print(f"  • Google Calendar: Settings → Import & Export → Import")
     print(f"  • Outlook: File → Open & Export → Import/Export → Import an iCalendar (.ics)")
     print(f"  • Apple Calendar: File → Import")
     print(f"  • Or simply double-click the .ics file!")
     
-    logger.info(f"Exported {len(events)} events to iCal: {output_file}")
+    logger.info(f"Exported {exported} events to iCal: {output_file}")
     
-    return len(events)
+    return exported
+
+
+@with_error_handling("Batch iCal Export")
+def export_events_to_ical(event_ids: List[int], output_file: str = "events.ics") -> int:
+    """
+    Export specific events to a single iCal file with one query
+    
+    Args:
+        event_ids: Event IDs to export
+        output_file: Path to output .ics file
+    
+    Returns:
+        Number of events exported
+    """
+    if not event_ids:
+        print("No events to export")
+        return 0
+    
+    return export_to_ical(event_ids=event_ids, output_file=output_file)
 
 
 @with_error_handling("Single Event iCal Export")
@@ -329,41 +716,49 @@ def export_event_to_ical(event_id: int, output_file: Optional[str] = None) -> bo
     if output_file is None:
         output_file = f"event_{event_id}.ics"
     
-    count = export_to_ical(event_ids=[event_id], output_file=output_file)
+    count = export_events_to_ical([event_id], output_file=output_file)
     return count > 0
 
 
 def get_export_statistics():
     """Get statistics about available events for export"""
-    conn = get_db_connection()
+    today = _today()
+    conn = _get_connection()
     cursor = conn.cursor()
     
-    # Total upcoming events
-    cursor.execute('SELECT COUNT(*) FROM events WHERE date >= DATE("now")')
-    total = cursor.fetchone()[0]
-    
-    # Events by type
+    # Total, per-type and per-month counts in one round trip; the first
+    # column tags which statistic each row belongs to
     cursor.execute('''
-        SELECT ec.event_type, COUNT(*)
+        SELECT 'total', NULL, COUNT(*)
+        FROM events
+        WHERE date >= :today
+        UNION ALL
+        SELECT 'type', ec.event_type, COUNT(*)
         FROM events e
         LEFT JOIN enhanced_content ec ON e.id = ec.event_id
-        WHERE e.date >= DATE("now") AND ec.event_type IS NOT NULL
+        WHERE e.date >= :today AND ec.event_type IS NOT NULL
         GROUP BY ec.event_type
-        ORDER BY COUNT(*) DESC
-    ''')
-    by_type = cursor.fetchall()
-    
-    # Events by month
-    cursor.execute('''
-        SELECT strftime('%Y-%m', date) as month, COUNT(*)
+        UNION ALL
+        SELECT 'month', strftime('%Y-%m', date), COUNT(*)
         FROM events
-        WHERE date >= DATE("now")
-        GROUP BY month
-        ORDER BY month
-    ''')
-    by_month = cursor.fetchall()
-    
-    conn.close()
+        WHERE date >= :today
+        GROUP BY 2
+    ''', {'today': today})
+    
+    total = 0
+    by_type = []
+    by_month = []
+    for kind, label, count in cursor:
+        if kind == 'total':
+            total = count
+        elif kind == 'type':
+            by_type.append((label, count))
+        else:
+            by_month.append((label, count))
+    
+    # A compound SELECT takes only one ORDER BY, so order each part here
+    by_type.sort(key=lambda row: row[1], reverse=True)
+    by_month.sort(key=lambda row: (row[0] is not None, row[0] or ''))
     
     return {
         'total': total,